@@ -0,0 +1,159 @@
+# class_reports.py
+# 반 전체 학생의 보고서(피드백, 점수 비교, 성적 추이 그래프)를 프로세스 풀에서 나눠 만들고
+# 하나의 zip 파일로 묶습니다.
+import base64
+import html
+import io
+import multiprocessing
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from sheet_data import clean_id
+
+CHUNK_SIZE = 25
+
+
+# ---------- 보고서 입력 만들기 (메인 프로세스) ----------
+def build_report_inputs(feedback_df, score_df, student_ids):
+    """학생마다 보고서에 필요한 값만 담은 작은 dict 목록을 만듭니다. (워커로 보내기 쉽도록)"""
+    summary_col, score_col, feedback_col = feedback_df.columns[:3]
+    fb = feedback_df.drop_duplicates("_id_clean").set_index("_id_clean")
+    all_scores = feedback_df["_score_parsed"].dropna().astype(float)
+    avg_score = float(all_scores.mean()) if not all_scores.empty else None
+    median_score = float(np.median(all_scores)) if not all_scores.empty else None
+
+    exam_cols = list(score_df.columns[2:6])
+    sc = score_df.assign(_id_clean=score_df[score_df.columns[0]].apply(clean_id))
+    sc = sc.drop_duplicates("_id_clean").set_index("_id_clean")
+    exams = sc[exam_cols].apply(pd.to_numeric, errors="coerce")
+
+    items = []
+    for sid in student_ids:
+        item = {
+            "student_id": sid,
+            "name": "",
+            "summary": "",
+            "feedback": "",
+            "raw_score": "",
+            "score": None,
+            "avg_score": avg_score,
+            "median_score": median_score,
+            "exam_labels": [str(c) for c in exam_cols],
+            "exam_scores": [],
+        }
+        if sid in fb.index:
+            row = fb.loc[sid]
+            item["name"] = row["_name_clean"]
+            item["summary"] = row[summary_col] if pd.notna(row[summary_col]) else ""
+            item["feedback"] = row[feedback_col] if pd.notna(row[feedback_col]) else ""
+            item["raw_score"] = row[score_col] if pd.notna(row[score_col]) else ""
+            item["score"] = None if pd.isna(row["_score_parsed"]) else float(row["_score_parsed"])
+        if sid in exams.index:
+            item["exam_scores"] = [None if pd.isna(v) else float(v) for v in exams.loc[sid]]
+            if not item["name"]:
+                item["name"] = str(sc.loc[sid, score_df.columns[1]])
+        items.append(item)
+    return items
+
+
+# ---------- 보고서 그리기 (워커 프로세스) ----------
+def _png_base64(fig):
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=100, bbox_inches="tight")
+    return base64.b64encode(buf.getvalue()).decode("ascii")
+
+def _score_chart(item):
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(4, 2.6))
+    ax = fig.subplots()
+    labels = ["Me", "Mean", "Median"]
+    values = [item["score"], item["avg_score"], item["median_score"]]
+    ax.bar(labels, values, color=["#1f77b4", "#9ecae1", "#9ecae1"], width=0.5)
+    ax.set_ylim(0, 100)
+    for x, v in zip(labels, values):
+        ax.text(x, v + 2, f"{v:.1f}", ha="center")
+    return _png_base64(fig)
+
+def _trend_chart(item):
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(5, 2.6))
+    ax = fig.subplots()
+    y = [np.nan if v is None else v for v in item["exam_scores"]]
+    x = range(len(y))
+    ax.plot(x, y, color="salmon", marker="o")
+    ax.set_xticks(list(x))
+    ax.set_xticklabels([f"#{i + 1}" for i in x])
+    ax.set_ylim(0, 100)
+    return _png_base64(fig)
+
+def render_report(item):
+    """(파일 이름, HTML 바이트)를 돌려줍니다."""
+    e = html.escape
+    parts = [
+        "<!DOCTYPE html><html lang='ko'><head><meta charset='utf-8'>",
+        f"<title>{e(item['student_id'])} {e(item['name'])} 보고서</title>",
+        "<style>body{font-family:sans-serif;max-width:720px;margin:24px auto;}"
+        ".box{padding:12px;border-left:6px solid #ddd;background:#fafafa;white-space:pre-wrap;}</style>",
+        "</head><body>",
+        f"<h1>{e(item['name'])} <small>({e(item['student_id'])})</small></h1>",
+        "<h2>📝 과제 내용 요약</h2>",
+        f"<div class='box'>{e(str(item['summary']))}</div>",
+        "<h2>📊 점수 비교</h2>",
+    ]
+    if item["score"] is None or item["avg_score"] is None:
+        parts.append(f"<p>점수 데이터가 부족합니다. 원점수: {e(str(item['raw_score']))}</p>")
+    else:
+        parts.append(f"<img alt='점수 비교' src='data:image/png;base64,{_score_chart(item)}'>")
+        parts.append(
+            f"<p>평균: {item['avg_score']:.1f}점 · 중간: {item['median_score']:.1f}점 · "
+            f"내 점수: {item['score']:.1f}점</p>"
+        )
+    parts.append("<h2>📈 성적 추이</h2>")
+    if any(v is not None for v in item["exam_scores"]):
+        parts.append(f"<img alt='성적 추이' src='data:image/png;base64,{_trend_chart(item)}'>")
+        cells = "".join(
+            f"<td>{e(label)}: {'-' if v is None else f'{v:.1f}'}</td>"
+            for label, v in zip(item["exam_labels"], item["exam_scores"])
+        )
+        parts.append(f"<table><tr>{cells}</tr></table>")
+    else:
+        parts.append("<p>시험 점수 기록이 없습니다.</p>")
+    parts.append("<h2>💬 피드백</h2>")
+    parts.append(f"<div class='box'>{e(str(item['feedback']))}</div>")
+    parts.append("</body></html>")
+
+    # zip 항목 이름: 숫자만 남긴 학번 + 허용된 문자만 남긴 이름 (경로 구분자, .., 제어 문자 차단)
+    safe_id = clean_id(item["student_id"]) or "unknown"
+    safe_name = re.sub(r"[^\w가-힣-]", "_", str(item["name"]), flags=re.ASCII)[:40]
+    filename = f"{safe_id}_{safe_name}.html"
+    return filename, "".join(parts).encode("utf-8")
+
+def render_chunk(items):
+    return [render_report(item) for item in items]
+
+
+# ---------- 일괄 생성 ----------
+def generate_reports(items, chunk_size=CHUNK_SIZE, max_workers=None, progress=None):
+    """items를 chunk_size개씩 나눠 프로세스 풀에서 그린 뒤 zip 바이트를 돌려줍니다.
+    progress(완료 수, 전체 수)가 주어지면 묶음이 끝날 때마다 호출합니다."""
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+    buf = io.BytesIO()
+    done = 0
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        # 스레드가 여러 개인 Streamlit 서버에서 fork 하지 않도록 spawn 사용
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            futures = [pool.submit(render_chunk, chunk) for chunk in chunks]
+            for future in as_completed(futures):
+                results = future.result()
+                for filename, data in results:
+                    zf.writestr(filename, data)
+                done += len(results)
+                if progress:
+                    progress(done, len(items))
+    return buf.getvalue()
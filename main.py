@@ -1,5 +1,7 @@
 import streamlit as st
 import requests
+from write_queue import WriteQueue
+from thumbnail_cache import fetch_thumbnail, thumbnail_data_uri
 
 st.set_page_config(page_title="학생 메인/프로필", page_icon="🌷", layout="centered")
 
@@ -22,6 +24,19 @@ def call_api(action: str, payload: dict):
     except ValueError:
         return {"ok": False, "error": f"JSON 파싱 실패: {res.text[:200]}"}
 
+@st.cache_resource
+def get_write_queue():
+    # 프로세스당 하나의 큐 + 백그라운드 전송 스레드
+    queue = WriteQueue(call_api)
+    queue.start()
+    return queue
+
+def queue_update_profile(label: str, payload: dict):
+    # 디스크에 기록만 하고 바로 반환 (전송은 백그라운드에서)
+    item_id = get_write_queue().enqueue("updateProfile", st.session_state.student_id,
+                                        {"studentId": st.session_state.student_id, **payload})
+    st.session_state.queued_writes.append({"label": label, "id": item_id})
+
 def hide_sidebar_when_logged_out():
     st.markdown("""
     <style>
@@ -44,10 +59,15 @@ def hide_sidebar_when_logged_out():
     </style>
     """, unsafe_allow_html=True)
 
+# 서버가 재시작돼도 남아 있는 대기 요청을 바로 보내도록 워커를 먼저 띄움
+get_write_queue()
+
 # ---------------- 세션 상태 ----------------
 for key in ["logged_in", "student_id", "student_name", "profile_image"]:
     if key not in st.session_state:
         st.session_state[key] = "" if key != "logged_in" else False
+if "queued_writes" not in st.session_state:
+    st.session_state.queued_writes = []
 
 
 # ---------------- UI ----------------
@@ -132,9 +152,11 @@ else:
 
     # --- 프로필 표시 영역 ---
     # 이미지 + 텍스트를 한 블록에 통합
+    # 원본 대신 서버에서 줄인 썸네일(data URI). 디스크 캐시에 없으면 백그라운드에서 만들어 두고 다음 화면부터 표시
+    thumb = thumbnail_data_uri(st.session_state.profile_image)
     profile_html = f"""
     <div class="profile-wrapper">
-    <div class="profile-img" style="{'background-image: url(' + st.session_state.profile_image + ');' if st.session_state.profile_image else ''}"></div>
+    <div class="profile-img" style="{'background-image: url(' + thumb + ');' if thumb else ''}"></div>
         <div class="profile-info">
             <div class="profile-id">{st.session_state.student_id}</div>
             <div class="profile-name">{st.session_state.student_name}</div>
@@ -149,13 +171,16 @@ else:
     new_img = st.text_input("이미지 URL 입력", value=st.session_state.profile_image, placeholder="https://...")
 
     if st.button("이미지 저장"):
-        resp = call_api("updateProfile", {"studentId": st.session_state.student_id, "imageUrl": new_img})
-        if resp.get("ok"):
+        try:
+            if new_img:
+                fetch_thumbnail(new_img)  # 저장할 때 한 번만 내려받아 썸네일 생성
+        except Exception as e:
+            st.error(f"이미지를 불러오지 못했습니다: {e}")
+        else:
+            queue_update_profile("프로필 이미지", {"imageUrl": new_img})
             st.session_state.profile_image = new_img  # 즉시 반영
-            st.success("프로필 이미지가 업데이트되었습니다.")
+            st.success("프로필 이미지 저장 요청이 접수되었습니다.")
             st.rerun()
-        else:
-            st.error(f"저장 실패: {resp.get('error')}")
 
     st.subheader("비밀번호 변경")
     new_pw = st.text_input("새 비밀번호", type="password")
@@ -163,11 +188,27 @@ else:
         if not new_pw:
             st.warning("새 비밀번호를 입력하세요.")
         else:
-            resp = call_api("updateProfile", {"studentId": st.session_state.student_id, "newPassword": new_pw})
-            if resp.get("ok"):
-                st.success("비밀번호가 변경되었습니다.")
-            else:
-                st.error(f"변경 실패: {resp.get('error')}")
+            queue_update_profile("비밀번호", {"newPassword": new_pw})
+            st.success("비밀번호 변경 요청이 접수되었습니다.")
+
+    # --- 저장 요청 처리 상태 ---
+    if st.session_state.queued_writes:
+        st.subheader("저장 상태")
+        status_text = {
+            "pending": "⏳ 전송 대기",
+            "sending": "📤 전송 중",
+            "sent": "✅ 반영 완료",
+            "failed": "❌ 실패",
+        }
+        queue = get_write_queue()
+        for item in reversed(st.session_state.queued_writes[-5:]):
+            info = queue.status(item["id"])
+            line = f"{item['label']}: {status_text.get(info['status'], '알 수 없음')}"
+            if info["error"]:
+                line += f" (재시도 {info['attempts']}회, 오류: {info['error']})"
+            st.write(line)
+        if st.button("상태 새로고침"):
+            st.rerun()
 
     st.divider()
     if st.button("로그아웃"):
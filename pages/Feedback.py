@@ -2,7 +2,7 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import altair as alt
-import re
+from sheet_data import load_feedback_sheet, clean_id, clean_name
 
 st.set_page_config(page_title="학생 피드백 조회", page_icon="🎓", layout="centered")
 
@@ -51,16 +51,13 @@ st.markdown("""
 st.markdown('<div class="header-title">🎓 학생 피드백 조회</div>', unsafe_allow_html=True)
 
 # ---------- 구글 시트 불러오기 ----------
-sheet_csv_url = "https://docs.google.com/spreadsheets/d/1EUt6naZuxN1eJ0CIbUAphijpZU9r5pFJ-nKj4bA_l2Q/export?format=csv"
-
-@st.cache_data(ttl=300)
-def load_sheet(url):
-    df = pd.read_csv(url, dtype=str)
-    df.columns = [c.strip() for c in df.columns]
-    return df
+# 서버 간 공유 스냅샷(sheet_cache) 위에 프로세스 내 캐시를 한 번 더 둠
+@st.cache_data(ttl=60)
+def load_sheet():
+    return load_feedback_sheet()
 
 try:
-    df = load_sheet(sheet_csv_url)
+    df = load_sheet()
 except Exception as e:
     st.error("구글 시트를 불러오지 못했습니다. 공개 설정 또는 URL을 확인하세요.")
     st.stop()
@@ -78,21 +75,6 @@ feedback_col = df.columns[2]
 id_col = df.columns[3]
 name_col = df.columns[4]
 
-# ---------- 데이터 전처리 ----------
-def clean_id(x):
-    if pd.isna(x): return ""
-    s = str(x).strip()
-    return re.sub(r'\D+', '', s)
-
-def clean_name(x):
-    if pd.isna(x): return ""
-    s = str(x).strip()
-    return re.sub(r'\s+', ' ', s)
-
-df['_id_clean'] = df[id_col].apply(clean_id)
-df['_name_clean'] = df[name_col].apply(clean_name)
-df['_score_parsed'] = df[score_col].apply(lambda x: float(re.sub(r'[^\d\.]', '', str(x))) if re.search(r'\d', str(x)) else np.nan)
-
 # ---------- 학생 찾기 ----------
 m = df[(df['_id_clean'] == clean_id(student_id)) & (df['_name_clean'] == clean_name(student_name))]
 if m.empty:
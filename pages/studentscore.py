@@ -3,29 +3,27 @@ import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 import time
+from sheet_data import load_score_sheet
 
 st.set_page_config(page_title="학생 성적 추이", layout="wide")
 
-# 구글 시트 CSV 링크
-SHEET_ID = "1Nap48AW6zmfwVqeTyVJ8oGcegt2j8VgD5ovBxxNKMgM"
-sheet_csv_url = f"https://docs.google.com/spreadsheets/d/{SHEET_ID}/export?format=csv"
-
-# 캐시 무효화 기능 추가
+# 서버 간 공유 스냅샷에서 불러오기 (force_reload 시 최신 시트로 갱신)
 def load_data(force_reload=False):
-    if force_reload or "data" not in st.session_state:
-        df = pd.read_csv(sheet_csv_url)
-        st.session_state["data"] = df
-    return st.session_state["data"]
+    return load_score_sheet(force=force_reload)
 
 st.title("📈 학생 성적 추이")
 st.caption("A열=학번, B열=이름, C~F열=시험 점수")
 
 # 🔄 새로고침 버튼
 if st.button("🔄 최신 데이터 불러오기"):
-    load_data(force_reload=True)
-    st.success("데이터를 새로 불러왔습니다.")
-    time.sleep(1)
-    st.rerun()
+    try:
+        load_data(force_reload=True)
+    except Exception:
+        st.error("구글 시트를 새로 불러오지 못했습니다. 잠시 후 다시 시도해주세요.")
+    else:
+        st.success("데이터를 새로 불러왔습니다.")
+        time.sleep(1)
+        st.rerun()
 
 df = load_data()
 
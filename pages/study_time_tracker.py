@@ -4,6 +4,7 @@ import pandas as pd
 import datetime
 import time
 import matplotlib.pyplot as plt
+from study_rollups import get_store
 
 EXPECTED_COLUMNS = ["date", "goal_hours", "goal_minutes", "real_hours", "real_minutes"]
 
@@ -19,6 +20,9 @@ st.title("📚 공부시간 트래커 + 🍅 뽀모도로 타이머")
 if "study_data" not in st.session_state:
     st.session_state["study_data"] = pd.DataFrame(columns=["date", "goal_hours", "goal_minutes", "real_hours", "real_minutes"])
 
+# 로그인한 학생은 기록을 저장하고 일/주/월 합계를 함께 갱신
+student_id = str(st.session_state.get("student_id", "")).strip() if st.session_state.get("logged_in") else ""
+
 if "pomodoro_running" not in st.session_state:
     st.session_state["pomodoro_running"] = False
     st.session_state["mode"] = "focus"
@@ -53,6 +57,8 @@ with col3:
                 "real_minutes": 0
             }])
             st.session_state["study_data"] = pd.concat([st.session_state["study_data"], new], ignore_index=True)
+        if student_id:
+            get_store().record_study(student_id, selected_date, goal_min=goal_h * 60 + goal_m)
         st.success("✅ 목표 공부시간이 저장되었습니다!")
 
 # -----------------------------
@@ -68,8 +74,23 @@ with col2:
 with col3:
     if st.button("실제 공부시간 저장"):
         existing = st.session_state["study_data"]["date"] == selected_date
+        # 로그인한 학생은 이전 세션에서 저장한 목표도 확인
+        saved = get_store().study_day(student_id, selected_date) if student_id else None
+        if not existing.any() and saved is not None and saved["goal_min"] > 0:
+            goal_hours, goal_minutes = divmod(saved["goal_min"], 60)
+            new = pd.DataFrame([{
+                "date": selected_date,
+                "goal_hours": goal_hours,
+                "goal_minutes": goal_minutes,
+                "real_hours": 0,
+                "real_minutes": 0
+            }])
+            st.session_state["study_data"] = pd.concat([st.session_state["study_data"], new], ignore_index=True)
+            existing = st.session_state["study_data"]["date"] == selected_date
         if existing.any():
             st.session_state["study_data"].loc[existing, ["real_hours", "real_minutes"]] = [real_h, real_m]
+            if student_id:
+                get_store().record_study(student_id, selected_date, real_min=real_h * 60 + real_m)
             st.success("✅ 실제 공부시간이 저장되었습니다!")
         else:
             st.warning("⚠️ 먼저 목표 공부시간을 설정해주세요!")
@@ -95,6 +116,15 @@ if not record.empty:
         else:
             st.success("🎯 오늘은 목표를 정확히 달성했어요! 완벽해요 ✨")
 
+if student_id:
+    summary = get_store().study_summary(student_id, selected_date)
+    col1, col2, col3 = st.columns(3)
+    col1.metric("🔥 연속 목표 달성", f"{summary['streak']}일", help=f"최고 기록 {summary['best_streak']}일")
+    col2.metric("해당 주 공부시간", f"{summary['week']['real_min'] // 60}시간 {summary['week']['real_min'] % 60}분",
+                f"목표 달성 {summary['week']['days_met']}/{summary['week']['days']}일", delta_color="off")
+    col3.metric("해당 월 공부시간", f"{summary['month']['real_min'] // 60}시간 {summary['month']['real_min'] % 60}분",
+                f"목표 달성 {summary['month']['days_met']}/{summary['month']['days']}일", delta_color="off")
+
 # -----------------------------
 # 뽀모도로 타이머
 # -----------------------------
@@ -129,22 +159,40 @@ if st.session_state["pomodoro_running"]:
             st.experimental_rerun()
 
 # -----------------------------
-# 최근 7일 그래프
+# 공부시간 추이 그래프
 # -----------------------------
 st.markdown("---")
-st.subheader("📈 최근 7일 공부시간 추이")
-
-if len(st.session_state["study_data"]) > 0:
-    df = st.session_state["study_data"].sort_values("date", ascending=True)
-    df["goal_total"] = df["goal_hours"] * 60 + df["goal_minutes"]
-    df["real_total"] = df["real_hours"] * 60 + df["real_minutes"]
-    recent = df.tail(7)
-
-    plt.figure(figsize=(6, 3))
-    plt.plot(recent["date"], recent["goal_total"], label="목표 공부시간", color="gray", linestyle="--", marker="o")
-    plt.plot(recent["date"], recent["real_total"], label="실제 공부시간", color="salmon", marker="o")
-    plt.ylabel("공부시간 (분)")
-    plt.legend()
-    st.pyplot(plt)
+
+if student_id:
+    # 저장된 일/주/월 합계만 읽으므로 기록이 쌓여도 빠름
+    st.subheader("📈 공부시간 추이")
+    period_label = st.radio("기간", ["최근 7일", "최근 12주", "최근 12개월"], horizontal=True)
+    period, limit = {"최근 7일": ("day", 7), "최근 12주": ("week", 12), "최근 12개월": ("month", 12)}[period_label]
+    recent = pd.DataFrame(get_store().study_series(student_id, period, limit))
+
+    if len(recent) > 0:
+        plt.figure(figsize=(6, 3))
+        plt.plot(recent["period_key"], recent["goal_min"], label="목표 공부시간", color="gray", linestyle="--", marker="o")
+        plt.plot(recent["period_key"], recent["real_min"], label="실제 공부시간", color="salmon", marker="o")
+        plt.ylabel("공부시간 (분)")
+        plt.legend()
+        st.pyplot(plt)
+    else:
+        st.info("저장된 공부시간 기록이 없습니다.")
 else:
-    st.info("최근 7일 데이터가 없습니다.")
+    st.subheader("📈 최근 7일 공부시간 추이")
+
+    if len(st.session_state["study_data"]) > 0:
+        df = st.session_state["study_data"].sort_values("date", ascending=True)
+        df["goal_total"] = df["goal_hours"] * 60 + df["goal_minutes"]
+        df["real_total"] = df["real_hours"] * 60 + df["real_minutes"]
+        recent = df.tail(7)
+
+        plt.figure(figsize=(6, 3))
+        plt.plot(recent["date"], recent["goal_total"], label="목표 공부시간", color="gray", linestyle="--", marker="o")
+        plt.plot(recent["date"], recent["real_total"], label="실제 공부시간", color="salmon", marker="o")
+        plt.ylabel("공부시간 (분)")
+        plt.legend()
+        st.pyplot(plt)
+    else:
+        st.info("최근 7일 데이터가 없습니다.")
@@ -0,0 +1,177 @@
+# teacher_dashboard.py
+import streamlit as st
+import pandas as pd
+import numpy as np
+import datetime
+from class_reports import build_report_inputs, generate_reports
+from sheet_data import load_feedback_sheet, load_score_sheet, clean_id, clean_name
+from study_rollups import get_store, period_keys
+
+st.set_page_config(page_title="교사 대시보드", page_icon="🧑‍🏫", layout="wide")
+
+# ---------- 교사 로그인 확인 ----------
+if st.session_state.get("role") != "teacher":
+    st.warning("⚠️ 교사 계정으로 로그인 후 이용할 수 있습니다. 로그인 페이지로 이동해주세요.")
+    st.stop()
+
+st.title("🧑‍🏫 교사 대시보드")
+st.caption("반별 점수 분포 · 성적 추세 · 학생 목록 (5분마다 자동 갱신)")
+
+SCORE_BINS = [0, 60, 70, 80, 90, 100.0001]
+SCORE_BIN_LABELS = ["0-59", "60-69", "70-79", "80-89", "90-100"]
+PAGE_SIZES = [20, 50, 100]
+
+# ---------- 집계 함수 ----------
+def class_of(student_id):
+    # 학번 앞 3자리 = 학년(1) + 반(2), 예: 10203 -> 1학년 2반
+    if len(student_id) < 3:
+        return "미분류"
+    return f"{int(student_id[0])}학년 {int(student_id[1:3])}반"
+
+def trend_slopes(scores):
+    """시험 순서(0, 1, 2, ...)에 대한 최소제곱 기울기를 학생별로 한 번에 계산합니다.
+    점수가 2개 미만인 학생은 NaN."""
+    y = scores.to_numpy(dtype=float)
+    x = np.broadcast_to(np.arange(y.shape[1], dtype=float), y.shape)
+    mask = ~np.isnan(y)
+    n = mask.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        x_mean = np.where(mask, x, 0).sum(axis=1) / n
+        y_mean = np.where(mask, y, 0).sum(axis=1) / n
+        dx = np.where(mask, x - x_mean[:, None], 0)
+        dy = np.where(mask, y - y_mean[:, None], 0)
+        slope = (dx * dy).sum(axis=1) / (dx * dx).sum(axis=1)
+    slope[n < 2] = np.nan
+    return pd.Series(slope, index=scores.index)
+
+# ---------- 학생별 · 반별 집계 (캐시) ----------
+@st.cache_data(ttl=300)
+def build_student_table():
+    fb = load_feedback_sheet()
+    fb = pd.DataFrame({
+        "학번": fb["_id_clean"],
+        "이름": fb["_name_clean"],
+        "과제 점수": fb["_score_parsed"],
+    })
+    fb = fb[fb["학번"] != ""].drop_duplicates("학번")
+
+    sc = load_score_sheet()
+    score_cols = sc.columns[2:6]
+    exams = sc[score_cols].apply(pd.to_numeric, errors="coerce")
+    sc = pd.DataFrame({
+        "학번": sc.iloc[:, 0].apply(clean_id),
+        "이름": sc.iloc[:, 1].apply(clean_name),
+        "최근 시험": exams.ffill(axis=1).iloc[:, -1],
+        "성적 추세": trend_slopes(exams).round(2),
+    })
+    sc = sc[sc["학번"] != ""].drop_duplicates("학번")
+
+    students = fb.merge(sc, on="학번", how="outer", suffixes=("", "_score"))
+    students["이름"] = students["이름"].fillna(students.pop("이름_score"))
+    students["반"] = students["학번"].apply(class_of)
+    students["점수 구간"] = pd.cut(students["과제 점수"], SCORE_BINS, right=False, labels=SCORE_BIN_LABELS)
+    students = students.sort_values("학번").reset_index(drop=True)
+    return students[["반", "학번", "이름", "과제 점수", "점수 구간", "최근 시험", "성적 추세"]]
+
+@st.cache_data(ttl=300)
+def build_class_summary(students):
+    grouped = students.groupby("반", sort=True)
+    summary = grouped.agg(
+        학생수=("학번", "size"),
+        과제평균=("과제 점수", "mean"),
+        과제중간=("과제 점수", "median"),
+        시험평균=("최근 시험", "mean"),
+        평균추세=("성적 추세", "mean"),
+        상승학생=("성적 추세", lambda s: int((s > 0).sum())),
+        하락학생=("성적 추세", lambda s: int((s < 0).sum())),
+    ).round(1)
+    distribution = (
+        students.groupby(["반", "점수 구간"], observed=False).size()
+        .unstack(fill_value=0)
+        .reindex(columns=SCORE_BIN_LABELS, fill_value=0)
+    )
+    return summary, distribution
+
+try:
+    students = build_student_table()
+except Exception:
+    st.error("구글 시트를 불러오지 못했습니다. 공개 설정 또는 URL을 확인하세요.")
+    st.stop()
+
+class_summary, score_distribution = build_class_summary(students)
+
+# ---------- 필터 ----------
+col1, col2, col3 = st.columns([1, 2, 1])
+with col1:
+    selected_class = st.selectbox("반 선택", ["전체"] + list(class_summary.index))
+with col2:
+    query = st.text_input("학번/이름 검색", placeholder="예: 10203 또는 홍길동").strip()
+with col3:
+    trend_filter = st.selectbox("성적 추세", ["전체", "상승", "하락"])
+
+view = students
+if selected_class != "전체":
+    view = view[view["반"] == selected_class]
+if query:
+    view = view[view["학번"].str.contains(query, regex=False) | view["이름"].str.contains(query, regex=False, na=False)]
+if trend_filter == "상승":
+    view = view[view["성적 추세"] > 0]
+elif trend_filter == "하락":
+    view = view[view["성적 추세"] < 0]
+
+# ---------- 반별 요약 ----------
+st.subheader("📊 반별 요약")
+if selected_class == "전체":
+    st.dataframe(class_summary, use_container_width=True)
+    st.bar_chart(score_distribution.sum())
+else:
+    st.dataframe(class_summary.loc[[selected_class]], use_container_width=True)
+    st.bar_chart(score_distribution.loc[selected_class])
+
+# ---------- 학생 목록 (페이지 단위로만 전송) ----------
+st.subheader(f"👥 학생 목록 ({len(view)}명)")
+
+col1, col2 = st.columns([1, 1])
+with col1:
+    page_size = st.selectbox("페이지당 학생 수", PAGE_SIZES)
+page_count = max(1, -(-len(view) // page_size))
+with col2:
+    page = st.number_input(f"페이지 (1~{page_count})", min_value=1, max_value=page_count, value=1, step=1)
+
+start = (page - 1) * page_size
+st.dataframe(view.iloc[start:start + page_size], use_container_width=True, hide_index=True)
+
+# ---------- 보고서 일괄 생성 ----------
+st.subheader("📦 보고서 일괄 생성")
+st.caption(f"현재 필터에 해당하는 학생 {len(view)}명의 보고서(HTML)를 zip 파일로 만듭니다.")
+
+if st.button("보고서 만들기", disabled=view.empty):
+    items = build_report_inputs(load_feedback_sheet(), load_score_sheet(), list(view["학번"]))
+    bar = st.progress(0.0, text="보고서 생성 중...")
+    st.session_state["report_zip"] = generate_reports(
+        items, progress=lambda done, total: bar.progress(done / total, text=f"보고서 생성 중... ({done}/{total})")
+    )
+    st.session_state["report_zip_name"] = f"reports_{selected_class}.zip".replace(" ", "_")
+    bar.progress(1.0, text=f"✅ {len(items)}명의 보고서를 만들었습니다.")
+
+if "report_zip" in st.session_state:
+    st.download_button("⬇️ 보고서 zip 내려받기", st.session_state["report_zip"],
+                       file_name=st.session_state["report_zip_name"], mime="application/zip")
+
+# ---------- 반별 달성률 (공부시간 · 투두 월간 합계) ----------
+st.subheader("✅ 이번 달 반별 달성률")
+month_key = period_keys(datetime.date.today())["month"]
+completion = pd.DataFrame(get_store().completion_by_student("month", month_key))
+if completion.empty:
+    st.info("이번 달에 저장된 공부시간·투두 기록이 없습니다.")
+else:
+    completion["반"] = completion["student_id"].apply(lambda s: class_of(clean_id(s)))
+    if selected_class != "전체":
+        completion = completion[completion["반"] == selected_class]
+    by_class = completion.groupby("반").sum(numeric_only=True)
+    st.dataframe(pd.DataFrame({
+        "기록 학생수": completion.groupby("반").size(),
+        "공부 목표 달성률 (%)": (by_class["days_met"] / by_class["days"].where(by_class["days"] > 0) * 100).round(1),
+        "목표 대비 공부시간 (%)": (by_class["real_min"] / by_class["goal_min"].where(by_class["goal_min"] > 0) * 100).round(1),
+        "투두 완료율 (%)": (by_class["todo_done"] / by_class["todo_total"].where(by_class["todo_total"] > 0) * 100).round(1),
+    }), use_container_width=True)
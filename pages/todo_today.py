@@ -1,6 +1,9 @@
 # todo_page_bullet.py
 import streamlit as st
 import pandas as pd
+import datetime
+import uuid
+from study_rollups import get_store, period_keys
 
 st.set_page_config(page_title="투두리스트", layout="centered")
 st.title("📋 오늘의 투두 보드")
@@ -10,9 +13,20 @@ st.title("📋 오늘의 투두 보드")
 # -----------------------------
 if "todos" not in st.session_state:
     st.session_state["todos"] = pd.DataFrame(columns=[
-        "subject", "goal_type", "goal_value", "actual_value", "progress"
+        "todo_id", "subject", "goal_type", "goal_value", "actual_value", "progress"
     ])
 
+# 로그인한 학생은 달성률을 저장하고 과목별 일/주/월 합계를 함께 갱신
+student_id = str(st.session_state.get("student_id", "")).strip() if st.session_state.get("logged_in") else ""
+today = datetime.date.today()
+
+def save_progress(row, progress):
+    # 값이 바뀐 경우에만 DB에 씀 (매 rerun 마다 모든 목표를 쓰지 않도록)
+    if progress == row["progress"]:
+        return
+    if student_id and pd.notna(row.get("todo_id")):
+        get_store().record_todo(student_id, row["todo_id"], today, row["subject"], progress)
+
 # -----------------------------
 # 목표 입력 영역
 # -----------------------------
@@ -39,6 +53,7 @@ with col3:
 
 if st.button("목표 추가", use_container_width=True):
     new_row = pd.DataFrame([{
+        "todo_id": uuid.uuid4().hex,
         "subject": subject,
         "goal_type": goal_type,
         "goal_value": goal_value,
@@ -46,6 +61,9 @@ if st.button("목표 추가", use_container_width=True):
         "progress": 0
     }])
     st.session_state["todos"] = pd.concat([st.session_state["todos"], new_row], ignore_index=True)
+    if student_id:
+        # 달성률 0%인 목표도 목표 수에 포함되도록 추가할 때 한 번 기록
+        get_store().record_todo(student_id, new_row.at[0, "todo_id"], today, subject, 0)
     st.success(f"✅ {subject} - {goal_type} 목표가 추가되었습니다!")
 
 # -----------------------------
@@ -106,6 +124,7 @@ else:
 
             st.session_state["todos"].at[i, "actual_value"] = actual_num
             st.session_state["todos"].at[i, "progress"] = progress
+            save_progress(row, progress)
 
             if progress == 100:
                 st.balloons()
@@ -114,6 +133,7 @@ else:
                 st.info(f"{progress}% 달성했어요.")
                 if st.button("다 했어요!", key=f"done_{i}", use_container_width=True):
                     st.session_state["todos"].at[i, "progress"] = 100
+                    save_progress(row, 100)
                     st.experimental_rerun()
 
         st.markdown("</div>", unsafe_allow_html=True)
@@ -126,3 +146,25 @@ if len(df) > 0:
     avg_progress = df["progress"].mean()
     st.markdown("---")
     st.subheader(f"🌟 오늘의 전체 목표 달성률은 **{avg_progress:.1f}%**예요!")
+
+# -----------------------------
+# 과목별 달성률 (이번 주 / 이번 달)
+# -----------------------------
+if student_id:
+    st.markdown("---")
+    st.subheader("📚 과목별 달성률")
+    keys = period_keys(today)
+    tabs = st.tabs(["이번 주", "이번 달"])
+    for tab, period in zip(tabs, ["week", "month"]):
+        with tab:
+            rows = pd.DataFrame(get_store().todo_by_subject(student_id, period, keys[period]))
+            if rows.empty:
+                st.info("저장된 목표 기록이 없습니다.")
+                continue
+            rows["완료율 (%)"] = (rows["done"] / rows["total"] * 100).round(1)
+            rows["평균 달성률 (%)"] = (rows["progress_sum"] / rows["total"]).round(1)
+            st.dataframe(
+                rows.rename(columns={"subject": "과목", "total": "목표 수", "done": "완료"})
+                [["과목", "목표 수", "완료", "완료율 (%)", "평균 달성률 (%)"]],
+                use_container_width=True, hide_index=True,
+            )
@@ -0,0 +1,108 @@
+# sheet_cache.py
+# 여러 Streamlit 서버 프로세스가 같은 시트를 각자 내려받지 않도록
+# 정규화된 DataFrame을 디스크 스냅샷으로 공유합니다.
+import contextlib
+import fcntl
+import os
+import time
+
+import pyarrow as pa
+
+DEFAULT_CACHE_DIR = os.environ.get("SHEET_CACHE_DIR", ".sheet_cache")
+FAILURE_BACKOFF = 60    # 갱신 실패 후 다시 시도하기까지 기다릴 시간(초)
+
+
+class ArrowSnapshotBackend:
+    """키마다 Arrow IPC 파일 하나를 두고 메모리 맵으로 읽습니다.
+    get / put / lock 세 메서드만 있으면 다른 저장소로 바꿔 끼울 수 있습니다."""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key, ext):
+        return os.path.join(self.cache_dir, f"{key}.{ext}")
+
+    def get(self, key):
+        """(DataFrame, 저장 시각) 또는 스냅샷이 없으면 None"""
+        path = self._path(key, "arrow")
+        try:
+            saved_at = os.stat(path).st_mtime
+            with pa.memory_map(path, "r") as source:
+                table = pa.ipc.open_file(source).read_all()
+        except (FileNotFoundError, pa.ArrowInvalid):
+            return None
+        return table.to_pandas(), saved_at
+
+    def put(self, key, df):
+        path = self._path(key, "arrow")
+        tmp = f"{path}.{os.getpid()}.tmp"
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        with pa.OSFile(tmp, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        # 읽는 쪽이 반쯤 쓴 파일을 보지 않도록 교체는 한 번에
+        os.replace(tmp, path)
+
+    def touch(self, key, saved_at):
+        """스냅샷의 저장 시각만 바꿉니다. (갱신 실패 시 재시도 간격 조절용)"""
+        try:
+            os.utime(self._path(key, "arrow"), (saved_at, saved_at))
+        except FileNotFoundError:
+            pass
+
+    @contextlib.contextmanager
+    def lock(self, key, blocking=True):
+        """프로세스 간 배타 잠금. blocking=False 에서 잠금을 못 얻으면 False 를 넘겨줍니다."""
+        with open(self._path(key, "lock"), "a") as f:
+            flags = fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB)
+            try:
+                fcntl.flock(f, flags)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+_backend = None
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        _backend = ArrowSnapshotBackend()
+    return _backend
+
+
+def load_frame(key, loader, ttl=300, force=False, backend=None):
+    """스냅샷이 ttl 초 이내면 그대로 읽고, 오래됐으면 한 프로세스만 loader()로 갱신합니다.
+    다른 프로세스가 갱신 중이거나 갱신에 실패하면 이전 스냅샷을 돌려줍니다. (force=True 일 때의 실패는 예외)"""
+    backend = backend or get_backend()
+    started = time.time()
+    cached = None if force else backend.get(key)
+    if cached is not None and started - cached[1] < ttl:
+        return cached[0]
+
+    # 돌려줄 스냅샷이 없거나 강제 갱신이면 잠금을 기다림
+    with backend.lock(key, blocking=force or cached is None) as acquired:
+        if not acquired:
+            return cached[0]
+        # 잠금을 기다리는 동안 다른 프로세스가 이미 갱신했을 수 있음
+        latest = backend.get(key)
+        if latest is not None:
+            refreshed = latest[1] >= started if force else time.time() - latest[1] < ttl
+            if refreshed:
+                return latest[0]
+        try:
+            df = loader()
+        except Exception:
+            # 강제 갱신은 실패를 그대로 알려야 화면에서 "새로 불러왔다"고 잘못 표시하지 않음
+            if force or latest is None:
+                raise
+            # 시트를 못 불러오면 이전 스냅샷을 쓰고, FAILURE_BACKOFF 초 동안은 다른 서버도 재시도하지 않게 함
+            backend.touch(key, time.time() - ttl + min(FAILURE_BACKOFF, ttl))
+            return latest[0]
+        backend.put(key, df)
+        return df
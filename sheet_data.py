@@ -0,0 +1,47 @@
+# sheet_data.py
+# 구글 시트 주소와 정규화 규칙을 한곳에 모아, 모든 페이지·서버가 같은 스냅샷을 쓰도록 합니다.
+import re
+
+import numpy as np
+import pandas as pd
+
+from sheet_cache import load_frame
+
+FEEDBACK_SHEET_URL = "https://docs.google.com/spreadsheets/d/1EUt6naZuxN1eJ0CIbUAphijpZU9r5pFJ-nKj4bA_l2Q/export?format=csv"
+SCORE_SHEET_ID = "1Nap48AW6zmfwVqeTyVJ8oGcegt2j8VgD5ovBxxNKMgM"
+SCORE_SHEET_URL = f"https://docs.google.com/spreadsheets/d/{SCORE_SHEET_ID}/export?format=csv"
+
+# ---------- 전처리 함수 ----------
+def clean_id(x):
+    if pd.isna(x): return ""
+    s = str(x).strip()
+    return re.sub(r'\D+', '', s)
+
+def clean_name(x):
+    if pd.isna(x): return ""
+    s = str(x).strip()
+    return re.sub(r'\s+', ' ', s)
+
+def parse_score(x):
+    return float(re.sub(r'[^\d\.]', '', str(x))) if re.search(r'\d', str(x)) else np.nan
+
+# ---------- 시트 불러오기 ----------
+def _fetch_feedback_sheet():
+    df = pd.read_csv(FEEDBACK_SHEET_URL, dtype=str)
+    df.columns = [c.strip() for c in df.columns]
+    # A~E열(요약, 점수, 피드백, 학번, 이름)이 있을 때만 정규화 열을 추가
+    if df.shape[1] >= 5:
+        df['_id_clean'] = df[df.columns[3]].apply(clean_id)
+        df['_name_clean'] = df[df.columns[4]].apply(clean_name)
+        df['_score_parsed'] = df[df.columns[1]].apply(parse_score)
+    return df
+
+def _fetch_score_sheet():
+    # A열(학번)은 문자열로 읽음: 빈 칸이 하나라도 있으면 float 로 추론돼 10201 -> "10201.0" 이 됨
+    return pd.read_csv(SCORE_SHEET_URL, converters={0: str})
+
+def load_feedback_sheet(force=False):
+    return load_frame("feedback", _fetch_feedback_sheet, force=force)
+
+def load_score_sheet(force=False):
+    return load_frame("scores", _fetch_score_sheet, force=force)
@@ -0,0 +1,254 @@
+# study_rollups.py
+# 공부시간·투두 기록을 저장할 때마다 학생별 일/주/월 합계를 함께 갱신해 두어,
+# 기간이 길어져도 요약과 그래프는 전체 기록을 다시 훑지 않고 바로 읽을 수 있게 합니다.
+import datetime
+import sqlite3
+
+DEFAULT_DB_PATH = ".study_rollups.sqlite3"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS study_days (
+    student_id TEXT NOT NULL,
+    day TEXT NOT NULL,
+    goal_min INTEGER NOT NULL DEFAULT 0,
+    real_min INTEGER NOT NULL DEFAULT 0,
+    met INTEGER NOT NULL DEFAULT 0,
+    streak INTEGER NOT NULL DEFAULT 0,      -- 이 날로 끝나는 연속 목표 달성 일수
+    PRIMARY KEY (student_id, day)
+);
+CREATE INDEX IF NOT EXISTS idx_study_days_streak ON study_days (student_id, streak);
+
+CREATE TABLE IF NOT EXISTS study_rollups (
+    student_id TEXT NOT NULL,
+    period TEXT NOT NULL,                   -- day / week / month
+    period_key TEXT NOT NULL,               -- 2026-10-19 / 2026-W42 / 2026-10
+    goal_min INTEGER NOT NULL DEFAULT 0,
+    real_min INTEGER NOT NULL DEFAULT 0,
+    days INTEGER NOT NULL DEFAULT 0,
+    days_met INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (student_id, period, period_key)
+);
+
+CREATE TABLE IF NOT EXISTS todo_items (
+    student_id TEXT NOT NULL,
+    todo_id TEXT NOT NULL,
+    day TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    progress INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (student_id, todo_id)
+);
+
+CREATE TABLE IF NOT EXISTS todo_rollups (
+    student_id TEXT NOT NULL,
+    period TEXT NOT NULL,
+    period_key TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    total INTEGER NOT NULL DEFAULT 0,
+    done INTEGER NOT NULL DEFAULT 0,
+    progress_sum INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (student_id, period, period_key, subject)
+);
+"""
+
+
+def period_keys(day):
+    """date -> {"day": "2026-10-19", "week": "2026-W42", "month": "2026-10"}"""
+    year, week, _ = day.isocalendar()
+    return {"day": day.isoformat(), "week": f"{year}-W{week:02d}", "month": day.strftime("%Y-%m")}
+
+
+class RollupStore:
+    def __init__(self, db_path=DEFAULT_DB_PATH):
+        self.db_path = db_path
+        conn = self._connect()
+        try:
+            conn.executescript(SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _write(self, fn, *args):
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            fn(conn, *args)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    # ---------------- 공부시간 ----------------
+    def record_study(self, student_id, day, goal_min=None, real_min=None):
+        """하루 기록을 저장하고 일/주/월 합계와 연속 달성 일수를 차이만큼 갱신합니다.
+        None 인 값은 기존 값을 유지합니다."""
+        self._write(self._record_study, str(student_id), day, goal_min, real_min)
+
+    def _record_study(self, conn, student_id, day, goal_min, real_min):
+        key = day.isoformat()
+        old = conn.execute(
+            "SELECT goal_min, real_min, met FROM study_days WHERE student_id=? AND day=?", (student_id, key)
+        ).fetchone()
+        old_goal, old_real, old_met = (old["goal_min"], old["real_min"], old["met"]) if old else (0, 0, 0)
+        goal = old_goal if goal_min is None else int(goal_min)
+        real = old_real if real_min is None else int(real_min)
+        met = int(goal > 0 and real >= goal)
+        if old and (goal, real) == (old_goal, old_real):
+            return
+
+        conn.execute(
+            "INSERT INTO study_days (student_id, day, goal_min, real_min, met) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (student_id, day) DO UPDATE SET goal_min=excluded.goal_min, "
+            "real_min=excluded.real_min, met=excluded.met",
+            (student_id, key, goal, real, met),
+        )
+        for period, period_key in period_keys(day).items():
+            conn.execute(
+                "INSERT INTO study_rollups (student_id, period, period_key, goal_min, real_min, days, days_met) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (student_id, period, period_key) DO UPDATE SET "
+                "goal_min=goal_min+excluded.goal_min, real_min=real_min+excluded.real_min, "
+                "days=days+excluded.days, days_met=days_met+excluded.days_met",
+                (student_id, period, period_key, goal - old_goal, real - old_real,
+                 0 if old else 1, met - old_met),
+            )
+        if met != old_met:
+            self._update_streaks(conn, student_id, day)
+
+    def _update_streaks(self, conn, student_id, changed_day):
+        # 바뀐 날부터 다음 날들로 진행하다가 값이 그대로인 날을 만나면 멈춤
+        day = changed_day
+        prev = conn.execute(
+            "SELECT streak FROM study_days WHERE student_id=? AND day=?",
+            (student_id, (day - datetime.timedelta(days=1)).isoformat()),
+        ).fetchone()
+        streak = prev["streak"] if prev else 0
+        while True:
+            row = conn.execute(
+                "SELECT met, streak FROM study_days WHERE student_id=? AND day=?", (student_id, day.isoformat())
+            ).fetchone()
+            if row is None:
+                break
+            streak = streak + 1 if row["met"] else 0
+            if streak == row["streak"] and day != changed_day:
+                break
+            conn.execute(
+                "UPDATE study_days SET streak=? WHERE student_id=? AND day=?",
+                (streak, student_id, day.isoformat()),
+            )
+            day += datetime.timedelta(days=1)
+
+    # ---------------- 투두 ----------------
+    def record_todo(self, student_id, todo_id, day, subject, progress):
+        """투두 하나의 달성률(0~100)을 저장하고 과목별 일/주/월 합계를 차이만큼 갱신합니다."""
+        self._write(self._record_todo, str(student_id), str(todo_id), day, subject, int(progress))
+
+    def _record_todo(self, conn, student_id, todo_id, day, subject, progress):
+        old = conn.execute(
+            "SELECT day, subject, progress FROM todo_items WHERE student_id=? AND todo_id=?", (student_id, todo_id)
+        ).fetchone()
+        if old and old["progress"] == progress:
+            return
+        old_progress = old["progress"] if old else 0
+        if old:
+            # 합계는 처음 등록한 날짜·과목 기준
+            day, subject = datetime.date.fromisoformat(old["day"]), old["subject"]
+        conn.execute(
+            "INSERT INTO todo_items (student_id, todo_id, day, subject, progress) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (student_id, todo_id) DO UPDATE SET progress=excluded.progress",
+            (student_id, todo_id, day.isoformat(), subject, progress),
+        )
+        done_delta = int(progress >= 100) - int(old_progress >= 100)
+        for period, period_key in period_keys(day).items():
+            conn.execute(
+                "INSERT INTO todo_rollups (student_id, period, period_key, subject, total, done, progress_sum) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (student_id, period, period_key, subject) DO UPDATE SET "
+                "total=total+excluded.total, done=done+excluded.done, progress_sum=progress_sum+excluded.progress_sum",
+                (student_id, period, period_key, subject, 0 if old else 1, done_delta, progress - old_progress),
+            )
+
+    # ---------------- 조회 ----------------
+    def _read(self, sql, params):
+        conn = self._connect()
+        try:
+            return [dict(r) for r in conn.execute(sql, params).fetchall()]
+        finally:
+            conn.close()
+
+    def study_series(self, student_id, period, limit=12):
+        """최근 limit개 기간의 {"period_key", "goal_min", "real_min", "days", "days_met"} (오래된 순)"""
+        rows = self._read(
+            "SELECT period_key, goal_min, real_min, days, days_met FROM study_rollups "
+            "WHERE student_id=? AND period=? ORDER BY period_key DESC LIMIT ?",
+            (str(student_id), period, limit),
+        )
+        return rows[::-1]
+
+    def study_day(self, student_id, day):
+        """하루 기록 {"goal_min", "real_min", "met", "streak"} 또는 없으면 None"""
+        rows = self._read(
+            "SELECT goal_min, real_min, met, streak FROM study_days WHERE student_id=? AND day=?",
+            (str(student_id), day.isoformat()),
+        )
+        return rows[0] if rows else None
+
+    def study_summary(self, student_id, day):
+        """day가 속한 일/주/월 합계와 현재·최고 연속 달성 일수"""
+        student_id = str(student_id)
+        summary = {}
+        for period, period_key in period_keys(day).items():
+            rows = self._read(
+                "SELECT goal_min, real_min, days, days_met FROM study_rollups "
+                "WHERE student_id=? AND period=? AND period_key=?",
+                (student_id, period, period_key),
+            )
+            summary[period] = rows[0] if rows else {"goal_min": 0, "real_min": 0, "days": 0, "days_met": 0}
+        # 그날 기록이 없거나, 오늘이라 아직 목표를 채울 수 있으면 전날까지의 연속 기록을 현재 값으로
+        selected = self.study_day(student_id, day)
+        if selected is not None and (selected["met"] or day != datetime.date.today()):
+            current = selected["streak"]
+        else:
+            prev = self.study_day(student_id, day - datetime.timedelta(days=1))
+            current = prev["streak"] if prev else 0
+        best = self._read("SELECT MAX(streak) AS best FROM study_days WHERE student_id=?", (student_id,))
+        summary["streak"] = current
+        summary["best_streak"] = best[0]["best"] or 0
+        return summary
+
+    def todo_by_subject(self, student_id, period, period_key):
+        """과목별 {"subject", "total", "done", "progress_sum"}"""
+        return self._read(
+            "SELECT subject, total, done, progress_sum FROM todo_rollups "
+            "WHERE student_id=? AND period=? AND period_key=? AND total>0 ORDER BY subject",
+            (str(student_id), period, period_key),
+        )
+
+    def completion_by_student(self, period, period_key):
+        """한 기간의 학생별 공부시간·투두 합계 (교사 대시보드용)"""
+        return self._read(
+            "SELECT ids.student_id, COALESCE(s.goal_min, 0) AS goal_min, COALESCE(s.real_min, 0) AS real_min, "
+            "COALESCE(s.days, 0) AS days, COALESCE(s.days_met, 0) AS days_met, "
+            "COALESCE(t.total, 0) AS todo_total, COALESCE(t.done, 0) AS todo_done "
+            "FROM (SELECT DISTINCT student_id FROM study_rollups WHERE period=? AND period_key=? "
+            "      UNION SELECT DISTINCT student_id FROM todo_rollups WHERE period=? AND period_key=?) ids "
+            "LEFT JOIN study_rollups s ON s.student_id=ids.student_id AND s.period=? AND s.period_key=? "
+            "LEFT JOIN (SELECT student_id, SUM(total) AS total, SUM(done) AS done FROM todo_rollups "
+            "           WHERE period=? AND period_key=? GROUP BY student_id) t ON t.student_id=ids.student_id",
+            (period, period_key) * 4,
+        )
+
+
+_store = None
+
+def get_store():
+    global _store
+    if _store is None:
+        _store = RollupStore()
+    return _store
@@ -0,0 +1,188 @@
+# thumbnail_cache.py
+# 프로필 이미지 URL을 한 번만 내려받아 표시 크기로 줄이고,
+# URL 해시를 키로 디스크(LRU)에 저장합니다.
+import base64
+import hashlib
+import io
+import ipaddress
+import os
+import socket
+import threading
+import time
+from urllib.parse import urljoin, urlparse
+
+import certifi
+import urllib3
+from PIL import Image, ImageOps
+
+CACHE_DIR = ".thumbnail_cache"
+THUMB_SIZE = 440                    # 220px 박스 x 2 (고해상도 화면)
+MAX_DOWNLOAD_BYTES = 10 * 1024 * 1024
+MAX_IMAGE_PIXELS = 40_000_000       # 압축 폭탄 방지
+FETCH_TIMEOUT = (3, 10)             # (연결, 읽기) 초
+FETCH_DEADLINE = 15                 # 다운로드 전체 제한 시간(초)
+MAX_REDIRECTS = 3
+PREFETCH_RETRY_AFTER = 60           # 실패한 URL은 이 시간(초) 동안 다시 내려받지 않음
+CACHE_MAX_BYTES = 50 * 1024 * 1024
+
+
+def _cache_path(url: str) -> str:
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    return os.path.join(CACHE_DIR, f"{key}.jpg")
+
+
+def _resolve_public_ip(host: str, port: int) -> str:
+    # 서버 내부망·메타데이터 주소(localhost, 10.x, 169.254.169.254 등)로 요청하지 않도록
+    try:
+        infos = socket.getaddrinfo(host, port, proto=socket.IPPROTO_TCP)
+    except socket.gaierror:
+        raise ValueError("이미지 주소의 호스트를 찾을 수 없습니다.")
+    ips = [info[4][0].split("%")[0] for info in infos]
+    if not ips or not all(ipaddress.ip_address(ip).is_global for ip in ips):
+        raise ValueError("허용되지 않는 이미지 주소입니다.")
+    return ips[0]
+
+
+def _open(url: str):
+    """검사한 IP로 직접 연결해 응답을 엽니다. (DNS를 다시 조회하지 않아 rebinding 으로 우회할 수 없음)"""
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https") or not parsed.hostname:
+        raise ValueError("http/https 주소만 사용할 수 있습니다.")
+    https = parsed.scheme == "https"
+    port = parsed.port or (443 if https else 80)
+    ip = _resolve_public_ip(parsed.hostname, port)
+
+    timeout = urllib3.Timeout(connect=FETCH_TIMEOUT[0], read=FETCH_TIMEOUT[1])
+    if https:
+        # 인증서·SNI 검사는 원래 호스트 이름 기준
+        pool = urllib3.HTTPSConnectionPool(ip, port, timeout=timeout, retries=False,
+                                           server_hostname=parsed.hostname, assert_hostname=parsed.hostname,
+                                           cert_reqs="CERT_REQUIRED", ca_certs=certifi.where())
+    else:
+        pool = urllib3.HTTPConnectionPool(ip, port, timeout=timeout, retries=False)
+    path = (parsed.path or "/") + (f"?{parsed.query}" if parsed.query else "")
+    return pool.urlopen("GET", path, headers={"Host": parsed.netloc.rsplit("@", 1)[-1]},
+                        redirect=False, preload_content=False)
+
+
+def _download(url: str) -> bytes:
+    deadline = time.monotonic() + FETCH_DEADLINE
+    # 리다이렉트는 직접 따라가며 매번 주소를 다시 검사
+    for _ in range(MAX_REDIRECTS + 1):
+        res = _open(url)
+        if res.status not in (301, 302, 303, 307, 308) or "Location" not in res.headers:
+            break
+        url = urljoin(url, res.headers["Location"])
+        res.release_conn()
+    else:
+        raise ValueError("리다이렉트가 너무 많습니다.")
+
+    try:
+        if res.status >= 400:
+            raise ValueError(f"이미지를 내려받지 못했습니다. (HTTP {res.status})")
+        if int(res.headers.get("Content-Length") or 0) > MAX_DOWNLOAD_BYTES:
+            raise ValueError("이미지 파일이 너무 큽니다.")
+        buf = io.BytesIO()
+        for chunk in res.stream(64 * 1024):
+            buf.write(chunk)
+            if buf.tell() > MAX_DOWNLOAD_BYTES:
+                raise ValueError("이미지 파일이 너무 큽니다.")
+            if time.monotonic() > deadline:
+                raise ValueError("이미지 다운로드 시간이 초과되었습니다.")
+    finally:
+        res.release_conn()
+    return buf.getvalue()
+
+
+def _make_thumbnail(data: bytes) -> bytes:
+    img = Image.open(io.BytesIO(data))
+    if img.width * img.height > MAX_IMAGE_PIXELS:
+        raise ValueError("이미지 해상도가 너무 큽니다.")
+    img.draft("RGB", (THUMB_SIZE, THUMB_SIZE))  # JPEG는 디코딩 단계에서 바로 축소
+    img = ImageOps.exif_transpose(img).convert("RGB")
+    # .profile-img 의 background-size: cover 와 같은 가운데 정사각형 자르기
+    img = ImageOps.fit(img, (THUMB_SIZE, THUMB_SIZE), Image.LANCZOS)
+    out = io.BytesIO()
+    img.save(out, format="JPEG", quality=85, optimize=True)
+    return out.getvalue()
+
+
+def _evict():
+    entries = []
+    for name in os.listdir(CACHE_DIR):
+        # 다른 프로세스가 쓰는 중인 *.tmp 파일은 건드리지 않음
+        if not name.endswith(".jpg"):
+            continue
+        path = os.path.join(CACHE_DIR, name)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            continue
+        entries.append((st.st_mtime, st.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= CACHE_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+
+
+def fetch_thumbnail(url: str) -> bytes:
+    """썸네일을 만들어 캐시에 저장하고 JPEG 바이트를 돌려줍니다. 실패하면 예외를 던집니다."""
+    path = _cache_path(url)
+    if os.path.exists(path):
+        os.utime(path)  # 최근 사용 시각 갱신
+        with open(path, "rb") as f:
+            return f.read()
+
+    thumb = _make_thumbnail(_download(url))
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(thumb)
+    os.replace(tmp, path)
+    _evict()
+    return thumb
+
+
+_prefetching = set()
+_prefetch_failed = {}               # url -> 실패 시각
+_prefetch_lock = threading.Lock()
+
+def _prefetch(url: str):
+    with _prefetch_lock:
+        failed_at = _prefetch_failed.get(url)
+        if url in _prefetching or (failed_at and time.monotonic() - failed_at < PREFETCH_RETRY_AFTER):
+            return
+        _prefetching.add(url)
+
+    def run():
+        try:
+            fetch_thumbnail(url)
+            _prefetch_failed.pop(url, None)
+        except Exception:
+            _prefetch_failed[url] = time.monotonic()
+        finally:
+            with _prefetch_lock:
+                _prefetching.discard(url)
+
+    threading.Thread(target=run, daemon=True, name="thumbnail-prefetch").start()
+
+
+def thumbnail_data_uri(url: str) -> str:
+    """CSS background-image 에 바로 넣을 data URI. 디스크 캐시만 읽으며 화면 그리기를 막지 않습니다.
+    캐시에 없으면 빈 문자열을 돌려주고, 백그라운드에서 썸네일을 만들어 둡니다."""
+    if not url:
+        return ""
+    path = _cache_path(url)
+    try:
+        os.utime(path)  # 최근 사용 시각 갱신
+        with open(path, "rb") as f:
+            thumb = f.read()
+    except FileNotFoundError:
+        _prefetch(url)
+        return ""
+    return "data:image/jpeg;base64," + base64.b64encode(thumb).decode("ascii")
@@ -0,0 +1,261 @@
+# write_queue.py
+# updateProfile 같은 변경 요청을 로컬 SQLite 큐에 먼저 기록하고,
+# 백그라운드 스레드가 백엔드(Apps Script)로 재시도하며 전송합니다.
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+
+DEFAULT_DB_PATH = ".write_queue.sqlite3"
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"   # 전송 대기
+SENDING = "sending"   # 워커가 전송 중
+SENT = "sent"         # 전송 완료
+FAILED = "failed"     # 재시도 한도 초과
+MERGED = "merged"     # 같은 학생의 이후 요청에 합쳐짐
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS mutations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    action TEXT NOT NULL,
+    student_id TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    merged_into INTEGER,
+    worker TEXT,                          -- 전송 중인 워커의 claim 토큰
+    next_attempt_at REAL NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_mutations_pending ON mutations (status, next_attempt_at);
+CREATE INDEX IF NOT EXISTS idx_mutations_student ON mutations (student_id, action, status);
+"""
+
+
+class WriteQueue:
+    """send(action, payload) -> {"ok": bool, "error": str} 형태의 함수(main.call_api)로
+    큐에 쌓인 요청을 전송합니다."""
+
+    def __init__(self, send, db_path=DEFAULT_DB_PATH, batch_size=20, max_attempts=8,
+                 base_delay=2.0, max_delay=300.0, stale_after=120.0):
+        self.send = send
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.stale_after = stale_after
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+        conn = self._connect()
+        try:
+            conn.executescript(SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    # ---------------- 요청 등록 ----------------
+    def enqueue(self, action, student_id, payload):
+        """요청을 디스크에 기록하고 바로 id를 돌려줍니다.
+        같은 학생의 같은 action이 아직 대기 중이면 필드를 합쳐 한 번만 전송합니다."""
+        student_id = str(student_id)
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            old = conn.execute(
+                "SELECT id, payload FROM mutations WHERE student_id=? AND action=? AND status=? "
+                "ORDER BY id DESC LIMIT 1",
+                (student_id, action, PENDING),
+            ).fetchone()
+            merged = json.loads(old["payload"]) if old else {}
+            merged.update(payload)
+            new_id = conn.execute(
+                "INSERT INTO mutations (action, student_id, payload, status, next_attempt_at, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (action, student_id, json.dumps(merged, ensure_ascii=False), PENDING, now, now, now),
+            ).lastrowid
+            if old:
+                conn.execute(
+                    "UPDATE mutations SET status=?, merged_into=?, payload='{}', updated_at=? WHERE id=?",
+                    (MERGED, new_id, now, old["id"]),
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        self._wake.set()
+        return new_id
+
+    def status(self, item_id):
+        """{"status", "attempts", "error"} 를 돌려줍니다. 합쳐진 요청은 합쳐진 대상의 상태를 따릅니다."""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT * FROM mutations WHERE id=?", (item_id,)).fetchone()
+            while row is not None and row["status"] == MERGED:
+                row = conn.execute("SELECT * FROM mutations WHERE id=?", (row["merged_into"],)).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return {"status": None, "attempts": 0, "error": None}
+        return {"status": row["status"], "attempts": row["attempts"], "error": row["error"]}
+
+    # ---------------- 백그라운드 전송 ----------------
+    def start(self, poll_interval=5.0):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(poll_interval,), daemon=True, name="write-queue")
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self, poll_interval):
+        while not self._stop.is_set():
+            try:
+                sent = self.flush()
+            except Exception:
+                # 워커 스레드가 죽으면 프로세스가 끝날 때까지 아무것도 전송되지 않으므로 기록만 하고 계속
+                logger.exception("write queue flush failed")
+                sent = 0
+            # 한 배치를 다 채웠으면 바로 다음 배치, 아니면 새 요청이나 다음 재시도 시각까지 대기
+            if sent < self.batch_size:
+                self._wake.wait(poll_interval)
+                self._wake.clear()
+
+    def _claim_next(self):
+        """대기 중인 요청 하나를 이 워커 몫으로 표시하고 (row, token)을 돌려줍니다.
+        전송 직전에 한 건씩 가져가므로 stale_after 는 요청 하나의 제한 시간보다만 길면 됩니다."""
+        now = time.time()
+        token = uuid.uuid4().hex
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            # 전송 도중 프로세스가 죽어 남은 항목은 다시 대기 상태로
+            conn.execute(
+                "UPDATE mutations SET status=?, worker=NULL WHERE status=? AND updated_at<?",
+                (PENDING, SENDING, now - self.stale_after),
+            )
+            # 같은 학생의 같은 action이 전송 중이면 건너뜀 (다른 서버가 이전 값을 보내는 중일 수 있음)
+            row = conn.execute(
+                "SELECT id, action, student_id, payload, attempts FROM mutations WHERE status=? AND next_attempt_at<=? "
+                "AND NOT EXISTS (SELECT 1 FROM mutations m WHERE m.student_id=mutations.student_id "
+                "AND m.action=mutations.action AND m.status=?) "
+                "ORDER BY id LIMIT 1",
+                (PENDING, now, SENDING),
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE mutations SET status=?, worker=?, updated_at=? WHERE id=?",
+                    (SENDING, token, now, row["id"]),
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        return row, token
+
+    def flush(self):
+        """대기 중인 요청을 최대 batch_size개 전송하고 처리한 개수를 돌려줍니다."""
+        count = 0
+        while count < self.batch_size:
+            row, token = self._claim_next()
+            if row is None:
+                break
+            try:
+                resp = self.send(row["action"], json.loads(row["payload"]))
+            except Exception as e:
+                resp = {"ok": False, "error": str(e)}
+            if not isinstance(resp, dict):
+                resp = {"ok": False, "error": f"예상하지 못한 응답: {str(resp)[:200]}"}
+            self._record_result(row, token, resp)
+            count += 1
+        return count
+
+    def _record_result(self, row, token, resp):
+        now = time.time()
+        attempts = row["attempts"] + 1
+        # 너무 오래 걸려 다른 워커가 다시 가져간 요청이면 결과를 기록하지 않음
+        owned = "WHERE id=? AND status='sending' AND worker=?"
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            still_owned = conn.execute(
+                f"SELECT 1 FROM mutations {owned}", (row["id"], token)
+            ).fetchone()
+            if still_owned is None:
+                pass
+            elif resp.get("ok"):
+                # 비밀번호 등 민감한 값은 전송 후 남기지 않음
+                conn.execute(
+                    f"UPDATE mutations SET status=?, attempts=?, error=NULL, payload='{{}}', worker=NULL, updated_at=? {owned}",
+                    (SENT, attempts, now, row["id"], token),
+                )
+            elif attempts >= self.max_attempts:
+                conn.execute(
+                    f"UPDATE mutations SET status=?, attempts=?, error=?, payload='{{}}', worker=NULL, updated_at=? {owned}",
+                    (FAILED, attempts, resp.get("error"), now, row["id"], token),
+                )
+            elif not self._merge_into_newer(conn, row, now):
+                delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+                conn.execute(
+                    f"UPDATE mutations SET status=?, attempts=?, error=?, next_attempt_at=?, worker=NULL, updated_at=? {owned}",
+                    (PENDING, attempts, resp.get("error"), now + delay, now, row["id"], token),
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def _merge_into_newer(self, conn, row, now):
+        # 실패한 요청보다 나중에 들어온 요청이 있으면, 오래된 값이 새 값을 덮어쓰지 않도록 처리합니다.
+        # - 새 요청이 대기 중: 실패한 요청의 필드를 새 요청 아래에 합치고 재시도하지 않음
+        # - 새 요청이 전송 중: 새 요청과 겹치는 필드는 빼고, 남는 필드만 재시도
+        newer = conn.execute(
+            "SELECT id, payload, status FROM mutations WHERE student_id=? AND action=? AND status IN (?, ?) AND id>? "
+            "ORDER BY id DESC LIMIT 1",
+            (row["student_id"], row["action"], PENDING, SENDING, row["id"]),
+        ).fetchone()
+        if newer is None:
+            return False
+        old_payload = json.loads(row["payload"])
+        new_payload = json.loads(newer["payload"])
+        if newer["status"] == SENDING:
+            rest = {k: v for k, v in old_payload.items() if k not in new_payload or new_payload[k] == v}
+            if any(k not in new_payload for k in rest):
+                conn.execute("UPDATE mutations SET payload=? WHERE id=?",
+                             (json.dumps(rest, ensure_ascii=False), row["id"]))
+                return False
+        else:
+            old_payload.update(new_payload)
+            conn.execute("UPDATE mutations SET payload=?, updated_at=? WHERE id=?",
+                         (json.dumps(old_payload, ensure_ascii=False), now, newer["id"]))
+        conn.execute(
+            "UPDATE mutations SET status=?, merged_into=?, attempts=attempts+1, payload='{}', worker=NULL, updated_at=? WHERE id=?",
+            (MERGED, newer["id"], now, row["id"]),
+        )
+        return True